@@ -11,25 +11,33 @@ and the OS will reinitialize them and re-read them as a "mouse".
 """
 
 import os
+import re
 import sys
+import pickle
+import operator
+import time
+import asyncio
 import logging
 import concurrent.futures
 from pathlib import Path
-from typing import Set, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from contextlib import contextmanager
 
 try:
-    import usb.core
-    import usb.backend.libusb1
+    import liburing
 except ImportError:
-    print("Error: pyusb library not installed.", file=sys.stderr)
-    sys.exit(1)
+    liburing = None  # Fall back to per-bus writes through the executor
 
 # Constants
 ELO_VENDOR_ID = 0x04E7     # Elo TouchSystems vendor ID
 DEFAULT_RESET_DELAY = 1.0  # Delay in seconds between disable and enable
+MAX_RESET_WORKERS = 8      # Thread cap for the sysfs writes, however many buses
+MAX_SCAN_WORKERS = 16      # Thread cap for the idVendor reads during discovery
 SYSFS_USB_PATH = Path("/sys/bus/usb/devices")
+CACHE_PATH = Path("/run/reset_elo_usb.cache")
+USB_DEVICE_RE = re.compile(r"^(?:usb(\d+)|(\d+)-[\d.]+)$")
+_DISABLE = b"0\n"          # Written to "authorized" to deauthorize a bus
+_ENABLE = b"1\n"           # Written to "authorized" to re-authorize a bus
 
 # Configure logging
 logging.basicConfig(
@@ -39,12 +47,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class USBBusInfo:
     """Container for USB bus information."""
     bus_number: int
     device_count: int
-    sysfs_path: Path
+    sysfs_path: str
 
 
 class USBBusResetError(Exception):
@@ -52,66 +60,143 @@ class USBBusResetError(Exception):
     pass
 
 
-@contextmanager
-def usb_backend():
+def read_vendor_id(device_path: str) -> Optional[bytes]:
     """
-    Context manager for USB backend operations.
+    Read the raw idVendor attribute of a sysfs USB device entry.
     
-    Yields:
-        usb.backend.libusb1.Backend: LibUSB backend instance
+    Args:
+        device_path: sysfs directory of the USB device
         
-    Note:
-        Ensures proper cleanup of USB resources.
+    Returns:
+        The 4 hex characters of the vendor ID, or None if the entry has no
+        idVendor attribute
     """
-    backend = usb.backend.libusb1.get_backend()
     try:
-        yield backend
+        fd = os.open(os.path.join(device_path, "idVendor"), os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        return os.read(fd, 4)
     finally:
-        # Cleanup is handled automatically by pyusb
-        pass
+        os.close(fd)
 
 
-def find_elo_buses(vendor_id: int = ELO_VENDOR_ID) -> Set[USBBusInfo]:
+def find_elo_buses(vendor_id: int = ELO_VENDOR_ID) -> Tuple[USBBusInfo, ...]:
     """
     Find all USB buses containing devices from the specified vendor.
     
+    Scans sysfs directly instead of enumerating through libusb, which is
+    much slower and gives us nothing sysfs does not already expose. The
+    idVendor reads are spread over a small thread pool, since sysfs reads
+    can stall on a slow bus.
+    
     Args:
         vendor_id: USB vendor ID to search for (default: Elo TouchSystems)
         
     Returns:
-        Set of USBBusInfo objects for buses containing matching devices
+        Tuple of USBBusInfo objects for buses containing matching devices
         
     Raises:
         USBBusResetError: If USB device enumeration fails
     """
-    buses = {}
+    wanted = f"{vendor_id:04x}".encode()
+    counts = {}
     
     try:
-        with usb_backend():
-            devices = usb.core.find(find_all=True, idVendor=vendor_id)
+        entries = []
+        with os.scandir(SYSFS_USB_PATH) as it:
+            for entry in it:
+                # Root hubs are "usb<bus>", devices "<bus>-<port path>"; skip interfaces
+                match = USB_DEVICE_RE.match(entry.name)
+                if match:
+                    entries.append((int(match.group(1) or match.group(2)), entry.path))
+        
+        if entries:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(entries), MAX_SCAN_WORKERS)) as executor:
+                vendors = executor.map(read_vendor_id, (path for _, path in entries))
+                for (bus_num, _), vendor in zip(entries, vendors):
+                    if vendor == wanted:
+                        counts[bus_num] = counts.get(bus_num, 0) + 1
+    except OSError as e:
+        raise USBBusResetError(f"Failed to enumerate USB devices: {e}")
+    
+    buses = {}
+    for bus_num, device_count in counts.items():
+        sysfs_path = str(SYSFS_USB_PATH / f"usb{bus_num}" / "authorized")
+        
+        # Verify the sysfs path exists
+        if not os.path.exists(sysfs_path):
+            logger.warning(f"sysfs path not found for bus {bus_num}: {sysfs_path}")
+            continue
             
-            for device in devices:
-                bus_num = device.bus
-                if bus_num not in buses:
-                    sysfs_path = SYSFS_USB_PATH / f"usb{bus_num}" / "authorized"
-                    
-                    # Verify the sysfs path exists
-                    if not sysfs_path.exists():
-                        logger.warning(f"sysfs path not found for bus {bus_num}: {sysfs_path}")
-                        continue
-                        
-                    buses[bus_num] = USBBusInfo(
-                        bus_number=bus_num,
-                        device_count=1,
-                        sysfs_path=sysfs_path
-                    )
-                else:
-                    buses[bus_num].device_count += 1
-                    
+        buses[bus_num] = USBBusInfo(
+            bus_number=bus_num,
+            device_count=device_count,
+            sysfs_path=sysfs_path
+        )
+    
+    return tuple(buses.values())
+
+
+def _sysfs_fingerprint(vendor_id: int) -> tuple:
+    """
+    Build the key that decides whether cached bus discovery is still valid.
+    
+    Args:
+        vendor_id: USB vendor ID the discovery was done for
+        
+    Returns:
+        Tuple of the vendor ID, the sysfs devices directory mtime and the
+        sorted device entry names (so plugging or unplugging invalidates it)
+    """
+    return (
+        vendor_id,
+        os.stat(SYSFS_USB_PATH).st_mtime_ns,
+        tuple(sorted(os.listdir(SYSFS_USB_PATH))),
+    )
+
+
+def load_cached_buses(vendor_id: int = ELO_VENDOR_ID) -> Optional[Tuple[USBBusInfo, ...]]:
+    """
+    Load previously discovered buses from the cache file.
+    
+    Args:
+        vendor_id: USB vendor ID to search for (default: Elo TouchSystems)
+        
+    Returns:
+        Tuple of cached USBBusInfo objects, or None if the cache is missing,
+        unreadable or stale
+    """
+    try:
+        with CACHE_PATH.open("rb") as f:
+            fingerprint, buses = pickle.load(f)
+        if not isinstance(buses, tuple) or fingerprint != _sysfs_fingerprint(vendor_id):
+            return None
     except Exception as e:
-        raise USBBusResetError(f"Failed to enumerate USB devices: {e}")
+        logger.debug(f"Ignoring bus cache {CACHE_PATH}: {e}")
+        return None
     
-    return set(buses.values())
+    if not all(os.path.exists(bus.sysfs_path) for bus in buses):
+        return None
+    return buses
+
+
+def save_cached_buses(buses: Tuple[USBBusInfo, ...], vendor_id: int = ELO_VENDOR_ID) -> None:
+    """
+    Persist discovered buses so the next run can skip the sysfs scan.
+    
+    Args:
+        buses: Tuple of USBBusInfo objects returned by find_elo_buses
+        vendor_id: USB vendor ID the buses were discovered for
+        
+    Note:
+        Failures are logged and otherwise ignored; the cache is an optimization.
+    """
+    try:
+        with CACHE_PATH.open("wb") as f:
+            pickle.dump((_sysfs_fingerprint(vendor_id), buses), f)
+    except OSError as e:
+        logger.debug(f"Could not write bus cache {CACHE_PATH}: {e}")
 
 
 def reset_usb_bus(bus_info: USBBusInfo, reset_delay: float = DEFAULT_RESET_DELAY) -> bool:
@@ -130,17 +215,20 @@ def reset_usb_bus(bus_info: USBBusInfo, reset_delay: float = DEFAULT_RESET_DELAY
         and re-enable the USB bus.
     """
     try:
-        # Disable the bus
-        logger.info(f"Disabling USB bus {bus_info.bus_number} ({bus_info.device_count} Elo device(s))")
-        bus_info.sysfs_path.write_text("0\n")
-        
-        # Wait for the specified delay
-        import time
-        time.sleep(reset_delay)
-        
-        # Re-enable the bus
-        logger.info(f"Re-enabling USB bus {bus_info.bus_number}")
-        bus_info.sysfs_path.write_text("1\n")
+        fd = os.open(bus_info.sysfs_path, os.O_WRONLY | os.O_SYNC)
+        try:
+            # Disable the bus
+            logger.info(f"Disabling USB bus {bus_info.bus_number} ({bus_info.device_count} Elo device(s))")
+            os.write(fd, _DISABLE)
+            
+            # Wait for the specified delay
+            time.sleep(reset_delay)
+            
+            # Re-enable the bus
+            logger.info(f"Re-enabling USB bus {bus_info.bus_number}")
+            os.pwrite(fd, _ENABLE, 0)
+        finally:
+            os.close(fd)
         
         logger.info(f"Successfully reset USB bus {bus_info.bus_number}")
         return True
@@ -153,72 +241,259 @@ def reset_usb_bus(bus_info: USBBusInfo, reset_delay: float = DEFAULT_RESET_DELAY
         return False
 
 
-def reset_buses_parallel(buses: Set[USBBusInfo], reset_delay: float = DEFAULT_RESET_DELAY) -> int:
+def _uring_write_all(ring, cqe, buses: List[USBBusInfo], buffer: bytearray, buf_index: int) -> List[bool]:
     """
-    Reset multiple USB buses in parallel using thread pool.
+    Write a registered buffer to every registered file in one io_uring submission.
     
     Args:
-        buses: Set of USBBusInfo objects to reset
+        ring: liburing.Ring with the buses' authorized fds and the payload
+            buffers registered
+        cqe: liburing.Cqe used to reap completions
+        buses: Buses in registered file order, used for error reporting
+        buffer: Registered payload buffer to write
+        buf_index: Index of buffer in the registered buffer table
+        
+    Returns:
+        Per-bus success flags, in registered file order
+    """
+    # This loop is on the critical path of each phase; bind the lookups once
+    get_sqe = liburing.io_uring_get_sqe
+    prep_write_fixed = liburing.io_uring_prep_write_fixed
+    fixed_file = liburing.IOSQE_FIXED_FILE
+    for index in range(len(buses)):
+        sqe = get_sqe(ring)
+        prep_write_fixed(sqe, index, buffer, buf_index, 0)
+        sqe.flags |= fixed_file
+        sqe.user_data = index
+    
+    liburing.io_uring_submit(ring)
+    
+    # Reap the whole wave before the caller queues the next one, so
+    # completions never pile up behind fresh submissions
+    liburing.io_uring_wait_cqe_nr(ring, cqe, len(buses))
+    results = [False] * len(buses)
+    for i in range(len(buses)):
+        entry = cqe[i]
+        index = entry.user_data
+        try:
+            entry.res  # raises OSError for a negative (errno) result
+            results[index] = True
+        except OSError as e:
+            logger.error(f"Write to bus {buses[index].bus_number} failed: {e}")
+    liburing.io_uring_cq_advance(ring, len(buses))
+    return results
+
+
+def open_authorized(buses: Tuple[USBBusInfo, ...]) -> Dict[USBBusInfo, int]:
+    """
+    Open the authorized attribute of every bus for writing.
+    
+    Args:
+        buses: USBBusInfo objects to open
+        
+    Returns:
+        Mapping of each bus that could be opened to its file descriptor
+        
+    Note:
+        Files are opened with O_SYNC. The kernel already applies the
+        (de)authorization inside write(), so this only makes that explicit.
+        Buses that fail to open are logged and left out of the mapping.
+        The caller is responsible for closing the returned descriptors.
+    """
+    fds = {}
+    for bus in buses:
+        try:
+            fds[bus] = os.open(bus.sysfs_path, os.O_WRONLY | os.O_SYNC)
+        except OSError as e:
+            logger.error(f"Failed to open {bus.sysfs_path}: {e}")
+    return fds
+
+
+async def reset_buses_uring(fds: Dict[USBBusInfo, int], reset_delay: float = DEFAULT_RESET_DELAY) -> int:
+    """
+    Reset multiple USB buses using batched io_uring submissions.
+    
+    Args:
+        fds: Open authorized file descriptors, as returned by open_authorized
         reset_delay: Delay in seconds between disable and enable operations
         
     Returns:
         Number of successfully reset buses
         
     Note:
-        Uses concurrent.futures for efficient parallel execution.
-        All buses are disabled simultaneously, then re-enabled after the delay.
+        Every phase costs a single io_uring_enter() instead of one write per bus.
+        The fds and both payloads are registered with the ring up front, so
+        the kernel does not revalidate them for every write. If the ring
+        cannot be set up, the executor path is used instead.
     """
-    if not buses:
-        logger.warning("No buses to reset")
-        return 0
+    opened = list(fds)
+    # Registered files and buffers must stay referenced until the ring is torn down
+    files = liburing.FileIndex(list(fds.values()))
+    buffers = [bytearray(_DISABLE), bytearray(_ENABLE)]
+    iovecs = liburing.Iovec(buffers)
     
-    logger.info(f"Resetting {len(buses)} USB bus(es) simultaneously")
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    try:
+        liburing.io_uring_queue_init(len(opened) * 2, ring)
+    except OSError as e:
+        # e.g. kernel.io_uring_disabled or a seccomp profile blocking io_uring
+        logger.warning(f"io_uring unavailable, falling back to threaded writes: {e}")
+        return await reset_buses_executor(fds, reset_delay=reset_delay)
     
-    # Use ThreadPoolExecutor for I/O-bound operations
-    with concurrent.futures.ThreadPoolExecutor(max_workers=len(buses)) as executor:
-        # Phase 1: Disable all buses simultaneously
-        disable_futures = []
-        for bus in buses:
-            future = executor.submit(
-                lambda b: b.sysfs_path.write_text("0\n"),
-                bus
-            )
-            disable_futures.append((future, bus))
-        
-        # Wait for all disable operations to complete
-        for future, bus in disable_futures:
-            try:
-                future.result(timeout=1.0)
+    try:
+        liburing.io_uring_register_files(ring, files)
+        liburing.io_uring_register_buffers(ring, iovecs)
+    except OSError as e:
+        # e.g. RLIMIT_MEMLOCK too low for buffer registration on older kernels
+        liburing.io_uring_queue_exit(ring)
+        logger.warning(f"io_uring registration failed, falling back to threaded writes: {e}")
+        return await reset_buses_executor(fds, reset_delay=reset_delay)
+    
+    try:
+        # Phase 1: Disable all buses in one submission
+        for bus, ok in zip(opened, _uring_write_all(ring, cqe, opened, buffers[0], 0)):
+            if ok:
                 logger.info(f"Disabled bus {bus.bus_number}")
-            except Exception as e:
-                logger.error(f"Failed to disable bus {bus.bus_number}: {e}")
-        
-        # Wait for the reset delay
-        import time
-        time.sleep(reset_delay)
-        
-        # Phase 2: Re-enable all buses simultaneously
-        enable_futures = []
-        for bus in buses:
-            future = executor.submit(
-                lambda b: b.sysfs_path.write_text("1\n"),
-                bus
-            )
-            enable_futures.append((future, bus))
         
-        # Count successful operations
+        # Wait for the reset delay without blocking the event loop
+        await asyncio.sleep(reset_delay)
+        
+        # Phase 2: Re-enable all buses in one submission
         success_count = 0
-        for future, bus in enable_futures:
-            try:
-                future.result(timeout=1.0)
+        for bus, ok in zip(opened, _uring_write_all(ring, cqe, opened, buffers[1], 1)):
+            if ok:
                 logger.info(f"Re-enabled bus {bus.bus_number}")
                 success_count += 1
-            except Exception as e:
-                logger.error(f"Failed to re-enable bus {bus.bus_number}: {e}")
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    
+    return success_count
+
+
+def _write_zero(fd: int) -> None:
+    """Deauthorize the bus behind an open authorized fd."""
+    os.write(fd, _DISABLE)
+
+
+def _write_one(fd: int) -> None:
+    """Re-authorize the bus behind an open authorized fd."""
+    os.pwrite(fd, _ENABLE, 0)
+
+
+async def _write_phase(fds: Dict[USBBusInfo, int], write: Callable[[int], None], action: str) -> int:
+    """
+    Run one phase of sysfs writes for all buses on the default executor.
+    
+    Args:
+        fds: Open authorized file descriptors, as returned by open_authorized
+        write: _write_zero or _write_one
+        action: Verb used in log messages ("disable" or "re-enable")
+        
+    Returns:
+        Number of buses whose write completed within the timeout
+        
+    Note:
+        All writes share a single 1 second wall-clock timeout, so one hung
+        write does not delay reporting on the others.
+    """
+    loop = asyncio.get_running_loop()
+    futures = {loop.run_in_executor(None, write, fd): bus for bus, fd in fds.items()}
+    _, not_done = await asyncio.wait(futures, timeout=1.0)
     
+    success_count = 0
+    for future, bus in futures.items():
+        if future in not_done:
+            future.cancel()
+            logger.error(f"Timed out trying to {action} bus {bus.bus_number}")
+        elif future.exception() is not None:
+            logger.error(f"Failed to {action} bus {bus.bus_number}: {future.exception()}")
+        else:
+            logger.info(f"{action.capitalize()}d bus {bus.bus_number}")
+            success_count += 1
     return success_count
 
 
+async def reset_buses_executor(fds: Dict[USBBusInfo, int], reset_delay: float = DEFAULT_RESET_DELAY) -> int:
+    """
+    Reset multiple USB buses by writing through the default executor.
+    
+    Args:
+        fds: Open authorized file descriptors, as returned by open_authorized
+        reset_delay: Delay in seconds between disable and enable operations
+        
+    Returns:
+        Number of successfully reset buses
+        
+    Note:
+        Only the writes run on worker threads; the delay between phases is
+        awaited on the event loop, so no thread is blocked sleeping.
+    """
+    asyncio.get_running_loop().set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(max_workers=min(len(fds), MAX_RESET_WORKERS))
+    )
+    
+    # Phase 1: Disable all buses simultaneously
+    await _write_phase(fds, _write_zero, "disable")
+    
+    # Wait for the reset delay without blocking the event loop
+    await asyncio.sleep(reset_delay)
+    
+    # Phase 2: Re-enable all buses simultaneously
+    return await _write_phase(fds, _write_one, "re-enable")
+
+
+async def reset_buses_parallel(buses: Tuple[USBBusInfo, ...], reset_delay: float = DEFAULT_RESET_DELAY) -> int:
+    """
+    Reset multiple USB buses in parallel using asyncio.
+    
+    Args:
+        buses: USBBusInfo objects to reset, sorted by bus number
+        reset_delay: Delay in seconds between disable and enable operations
+        
+    Returns:
+        Number of successfully reset buses
+        
+    Note:
+        Each authorized file is opened once and reused for both phases.
+        Uses io_uring batching when liburing is available; otherwise the
+        sysfs writes are dispatched to the event loop's default executor
+        and gathered per phase. All buses are disabled simultaneously, then
+        re-enabled after a non-blocking delay. If the reset is interrupted
+        before the enable phase completes (e.g. Ctrl-C during the delay),
+        every bus is re-enabled directly before the fds are closed.
+    """
+    if not buses:
+        logger.warning("No buses to reset")
+        return 0
+    
+    logger.info(f"Resetting {len(buses)} USB bus(es) simultaneously")
+    
+    fds = open_authorized(buses)
+    if not fds:
+        return 0
+    
+    enable_done = False
+    try:
+        if liburing is not None:
+            success_count = await reset_buses_uring(fds, reset_delay=reset_delay)
+        else:
+            success_count = await reset_buses_executor(fds, reset_delay=reset_delay)
+        enable_done = True
+        return success_count
+    finally:
+        if not enable_done:
+            # Never leave buses deauthorized because the reset was cut short
+            logger.error("Reset interrupted, re-enabling all buses directly")
+            for bus, fd in fds.items():
+                try:
+                    _write_one(fd)
+                except OSError as e:
+                    logger.error(f"Failed to re-enable bus {bus.bus_number}: {e}")
+        for fd in fds.values():
+            os.close(fd)
+
+
 def check_permissions() -> bool:
     """
     Check if the script has sufficient permissions to modify USB bus states.
@@ -232,13 +507,15 @@ def check_permissions() -> bool:
     return os.geteuid() == 0
 
 
-def main(reset_delay: Optional[float] = None, vendor_id: Optional[int] = None) -> int:
+def main(reset_delay: Optional[float] = None, vendor_id: Optional[int] = None,
+         use_cache: bool = True) -> int:
     """
     Main entry point for the USB bus reset utility.
     
     Args:
         reset_delay: Optional custom delay between disable/enable (seconds)
         vendor_id: Optional custom USB vendor ID to search for
+        use_cache: Reuse bus discovery from the previous run when still valid
         
     Returns:
         Exit code (0 for success, non-zero for errors)
@@ -253,22 +530,32 @@ def main(reset_delay: Optional[float] = None, vendor_id: Optional[int] = None) -
     vid = vendor_id or ELO_VENDOR_ID
     
     try:
-        # Find buses with Elo devices
-        buses = find_elo_buses(vendor_id=vid)
+        # Find buses with Elo devices, reusing the last discovery if possible
+        buses = load_cached_buses(vendor_id=vid) if use_cache else None
+        if buses is None:
+            buses = find_elo_buses(vendor_id=vid)
+            if use_cache:
+                save_cached_buses(buses, vendor_id=vid)
+        else:
+            logger.debug(f"Using cached bus discovery from {CACHE_PATH}")
         
         if not buses:
             logger.info(f"No USB buses found with devices from vendor 0x{vid:04X}")
             return 0
         
+        bus_number = operator.attrgetter("bus_number")
+        sorted_buses = tuple(sorted(buses, key=bus_number))
+        
         # Log discovered buses
-        total_devices = sum(bus.device_count for bus in buses)
-        logger.info(
-            f"Found {total_devices} Elo device(s) across {len(buses)} bus(es): "
-            f"{', '.join(str(bus.bus_number) for bus in sorted(buses, key=lambda b: b.bus_number))}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            total_devices = sum(bus.device_count for bus in sorted_buses)
+            logger.info(
+                f"Found {total_devices} Elo device(s) across {len(sorted_buses)} bus(es): "
+                f"{', '.join(str(bus_number(bus)) for bus in sorted_buses)}"
+            )
         
         # Reset buses in parallel
-        success_count = reset_buses_parallel(buses, reset_delay=delay)
+        success_count = asyncio.run(reset_buses_parallel(sorted_buses, reset_delay=delay))
         
         if success_count == len(buses):
             logger.info(f"Successfully reset all {success_count} bus(es)")
@@ -310,6 +597,11 @@ if __name__ == "__main__":
         default=ELO_VENDOR_ID,
         help=f"USB vendor ID to search for (default: 0x{ELO_VENDOR_ID:04X})"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always rescan sysfs instead of reusing {CACHE_PATH}"
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -321,4 +613,4 @@ if __name__ == "__main__":
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    sys.exit(main(reset_delay=args.delay, vendor_id=args.vendor))
+    sys.exit(main(reset_delay=args.delay, vendor_id=args.vendor, use_cache=not args.no_cache))